@@ -4,49 +4,173 @@ Quick Start Example: AI Agent with Cost Optimization
 Copy and paste this code to get started in under 5 minutes!
 """
 
+import asyncio
+import orjson
 import requests
-import json
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class SemanticCache:
+    """
+    Reuse a previous response when a new message means nearly the same thing
+    
+    Optional: pip install sentence-transformers numpy
+    """
+    def __init__(self, threshold=0.92, max_entries=1024, model_name="all-MiniLM-L6-v2"):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.model_name = model_name
+        self._model = None
+        self._embeddings = None  # (max_entries, dim) float32, rows are L2-normalized
+        self._last_used = None
+        self._responses = []
+        self._clock = 0
+    
+    def _embed(self, messages):
+        import numpy as np
+        
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        # One encode call for the whole batch: (len(messages), dim)
+        return self._model.encode(list(messages), normalize_embeddings=True).astype(np.float32)
+    
+    def lookup(self, message):
+        """
+        Return (cached_response or None, embedding of message)
+        """
+        return self.lookup_many([message])[0]
+    
+    def lookup_many(self, messages):
+        """
+        Return a (cached_response or None, embedding) pair per message
+        """
+        import numpy as np
+        
+        queries = self._embed(messages)
+        if not self._responses:
+            return [(None, query) for query in queries]
+        
+        # Cosine similarity of every cached prompt against every message in one matrix product
+        similarities = self._embeddings[:len(self._responses)] @ queries.T
+        best = np.argmax(similarities, axis=0)
+        
+        results = []
+        for column, (row, query) in enumerate(zip(best, queries)):
+            if similarities[row, column] < self.threshold:
+                results.append((None, query))
+                continue
+            self._clock += 1
+            self._last_used[row] = self._clock
+            results.append((self._responses[row], query))
+        return results
+    
+    def store(self, embedding, response):
+        """
+        Cache a response, evicting the least recently used entry when full
+        """
+        import numpy as np
+        
+        if self._embeddings is None:
+            self._embeddings = np.empty((self.max_entries, embedding.shape[0]), dtype=np.float32)
+            self._last_used = np.zeros(self.max_entries, dtype=np.int64)
+        
+        if len(self._responses) < self.max_entries:
+            slot = len(self._responses)
+            self._responses.append(response)
+        else:
+            slot = int(np.argmin(self._last_used))
+            self._responses[slot] = response
+        
+        self._clock += 1
+        self._embeddings[slot] = embedding
+        self._last_used[slot] = self._clock
 
 class CostOptimizedAIAgent:
-    def __init__(self, api_key, base_url="https://your-domain.com/api/v1"):
+    def __init__(self, api_key, base_url="https://your-domain.com/api/v1", semantic_cache=None):
         self.api_key = api_key
         self.base_url = base_url
+        self.semantic_cache = semantic_cache
         self.total_cost = 0
         self.total_saved = 0
         self.total_calls = 0
+        
+        # Reuse one pooled, keep-alive connection instead of a new TLS handshake per message
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "X-API-Key": api_key
+        })
+        # Only failed connection attempts are retried: the request never reached the
+        # server, so nothing was charged. Paid POSTs are never re-sent after a reply.
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(connect=3, read=0, status=0, other=0, backoff_factor=0.2)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
     def chat(self, message, max_cost=0.05):
         """
         Send a message to the AI and get an optimized response
         """
-        response = requests.post(
+        cached, embedding = self._cache_lookup(message)
+        if cached is not None:
+            return cached
+        
+        response = self.session.post(
             self.base_url,
-            headers={
-                "Content-Type": "application/json",
-                "X-API-Key": self.api_key
-            },
-            json={
-                "action": "optimize",
-                "prompt": message,
-                "maxCost": max_cost
-            }
+            data=orjson.dumps(self._payload(message, max_cost)),
+            timeout=(3.05, 30)
         )
         
         if response.status_code == 200:
-            result = response.json()
-            if result['success']:
-                # Track usage
-                self.total_cost += result['data']['optimizedCost']
-                self.total_saved += result['data']['savings']
-                self.total_calls += 1
-                
-                return {
-                    'message': result['data']['optimizedResponse'],
-                    'cost': result['data']['optimizedCost'],
-                    'saved': result['data']['savings'],
-                    'provider': result['data']['recommendedProvider']
-                }
+            return self._remember(embedding, self._track(orjson.loads(response.content)))
+        
+        return {'error': 'Failed to get response'}
+    
+    def _cache_lookup(self, message):
+        return self._cache_lookups([message])[0]
+    
+    def _cache_lookups(self, messages):
+        if self.semantic_cache is None:
+            return [(None, None)] * len(messages)
+        # Served locally: nothing was spent, so usage totals are left alone
+        return [
+            (None if cached is None else dict(cached, cost=0, saved=0, cached=True), embedding)
+            for cached, embedding in self.semantic_cache.lookup_many(messages)
+        ]
+    
+    def _remember(self, embedding, result):
+        if self.semantic_cache is not None and 'error' not in result:
+            self.semantic_cache.store(embedding, result)
+        return result
+    
+    def _payload(self, message, max_cost):
+        return {
+            "action": "optimize",
+            "prompt": message,
+            "maxCost": max_cost
+        }
+    
+    def _track(self, result):
+        """
+        Record usage for a successful API result and shape it for the caller
+        """
+        if result['success']:
+            # Track usage
+            self.total_cost += result['data']['optimizedCost']
+            self.total_saved += result['data']['savings']
+            self.total_calls += 1
+            
+            return {
+                'message': result['data']['optimizedResponse'],
+                'cost': result['data']['optimizedCost'],
+                'saved': result['data']['savings'],
+                'provider': result['data']['recommendedProvider']
+            }
         
         return {'error': 'Failed to get response'}
     
@@ -67,12 +191,58 @@ class CostOptimizedAIAgent:
     
     def batch_process(self, messages, max_cost_per_message=0.03):
         """
-        Process multiple messages efficiently
+        Process multiple messages efficiently (requests are sent concurrently)
+        
+        Inside a running event loop (Jupyter, async apps) asyncio.run is not
+        allowed, so messages are sent one by one there; await
+        batch_process_async instead to keep the concurrency.
         """
-        results = []
-        for message in messages:
-            result = self.chat(message, max_cost_per_message)
-            results.append(result)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.batch_process_async(messages, max_cost_per_message))
+        
+        return [self.chat(message, max_cost_per_message) for message in messages]
+    
+    async def batch_process_async(self, messages, max_cost_per_message=0.03, max_concurrency=16):
+        """
+        Send all messages concurrently over one aiohttp session
+        """
+        import aiohttp  # only needed for batch processing: pip install aiohttp
+        
+        # Embed every message in one batch, off the event loop
+        lookups = await asyncio.to_thread(self._cache_lookups, messages)
+        pending = [i for i, (cached, _) in enumerate(lookups) if cached is None]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _one(session, message):
+            async with semaphore:
+                async with session.post(self.base_url, data=orjson.dumps(self._payload(message, max_cost_per_message))) as response:
+                    if response.status != 200:
+                        return {'success': False}
+                    return orjson.loads(await response.read())
+        
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=16, keepalive_timeout=60)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={
+                "Content-Type": "application/json",
+                "X-API-Key": self.api_key
+            }
+        ) as session:
+            responses = await asyncio.gather(
+                *[_one(session, messages[i]) for i in pending],
+                return_exceptions=True
+            )
+        
+        results = [cached for cached, _ in lookups]
+        for i, result in zip(pending, responses):
+            # BaseException: gather can also hand back a CancelledError
+            if isinstance(result, BaseException):
+                results[i] = {'error': 'Failed to get response'}
+            else:
+                results[i] = self._remember(lookups[i][1], self._track(result))
         return results
 
 def main():
@@ -3,26 +3,185 @@ OnChain Agent SDK - Python
 Easy integration for AI agent cost optimization
 
 Installation:
-pip install requests
+pip install "httpx[http2]" orjson
 
 Usage:
-from onchain_agent_sdk import AIAgentClient
+from onchain_agent_sdk import AIAgentClient, AsyncAIAgentClient
 """
 
-import requests
-import json
-from typing import Optional, Dict, Any
+import asyncio
+import hashlib
+import inspect
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List
+from urllib.parse import urlencode
 
+import httpx
+import orjson
 
-class AIAgentClient:
+
+# Cache lifetimes in seconds: optimizations are stable, chat replies go stale sooner
+OPTIMIZE_CACHE_TTL = 7 * 24 * 3600
+CHAT_CACHE_TTL = 3600
+
+# Most messages the server accepts in one chat_batch request
+MAX_CHAT_BATCH_SIZE = 32
+
+# ijson path of the per-day entries in an analytics response
+_HISTORY_PREFIX = 'data.optimizationHistory.item'
+
+
+class LRUCache:
     """
-    Python client for OnChain Agent API
+    Thread-safe in-process LRU cache with per-entry expiry
     
-    Provides easy integration with AI agent cost optimization
-    and x402 micropayment protocol.
+    Exposes the get/setex subset of the redis-py client so it can be
+    swapped for (or layered in front of) a Redis instance.
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def setex(self, key: str, ttl: int, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+
+def _check_batch_size(batch_size: int) -> None:
+    if not 1 <= batch_size <= MAX_CHAT_BATCH_SIZE:
+        raise ValueError(f"batch_size must be between 1 and {MAX_CHAT_BATCH_SIZE}")
+
+
+@contextmanager
+def _api_errors() -> Iterator[None]:
+    """
+    Translate transport and HTTP status errors into the SDK's error types
+    """
+    try:
+        yield
+    except httpx.TimeoutException:
+        raise httpx.RequestError("Request timeout: API did not respond in time")
+    except httpx.NetworkError:
+        raise httpx.RequestError("Connection error: Unable to connect to API")
+    except httpx.HTTPStatusError as e:
+        try:
+            error_data = orjson.loads(e.response.content)
+            error_msg = error_data.get('error', f"HTTP {e.response.status_code}")
+        except (orjson.JSONDecodeError, AttributeError):
+            # Body is not JSON, or is JSON but not an object
+            error_msg = f"HTTP {e.response.status_code}: {e.response.reason_phrase}"
+        raise ValueError(error_msg)
+
+
+def _parse_response(response: httpx.Response) -> Dict[str, Any]:
+    response.raise_for_status()
+    result = orjson.loads(response.content)
+    
+    if not result.get('success', False):
+        raise ValueError(result.get('error', 'Unknown API error'))
+    
+    return result
+
+
+class _HistoryParser:
+    """
+    Push parser for a streamed analytics response
+    
+    feed() takes body chunks and returns the optimizationHistory entries
+    completed so far; close() checks the envelope like _parse_response.
+    Entries are held back until `success` is seen (the server sends it
+    first), so a failed response never yields anything.
+    """
+    
+    def __init__(self):
+        import ijson  # only needed for streamed analytics
+        self._ijson = ijson
+        self._events = ijson.sendable_list()
+        self._parser = ijson.parse_coro(self._events, use_float=True)
+        self._builder: Optional[Any] = None
+        self._depth = 0
+        self._entries: List[Dict[str, Any]] = []
+        self._success: Optional[bool] = None
+        self._error: Optional[str] = None
+    
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        with self._json_errors():
+            self._parser.send(chunk)
+        return self._drain()
+    
+    def close(self) -> List[Dict[str, Any]]:
+        with self._json_errors():
+            self._parser.close()
+        entries = self._drain()
+        if not self._success:
+            raise ValueError(self._error or 'Unknown API error')
+        return entries
+    
+    @contextmanager
+    def _json_errors(self) -> Iterator[None]:
+        try:
+            yield
+        except self._ijson.JSONError as e:
+            # Malformed or truncated body
+            raise ValueError(f"Invalid analytics response: {e}") from e
+    
+    def _drain(self) -> List[Dict[str, Any]]:
+        for prefix, event, value in self._events:
+            if self._builder is not None:
+                self._builder.event(event, value)
+                if event in ('start_map', 'start_array'):
+                    self._depth += 1
+                elif event in ('end_map', 'end_array'):
+                    self._depth -= 1
+                    if not self._depth:
+                        self._entries.append(self._builder.value)
+                        self._builder = None
+            elif prefix == _HISTORY_PREFIX and event == 'start_map':
+                self._builder = self._ijson.ObjectBuilder()
+                self._builder.event(event, value)
+                self._depth = 1
+            elif prefix == 'success':
+                self._success = value is True
+            elif prefix == 'error' and event == 'string':
+                self._error = value
+        del self._events[:]
+        
+        if not self._success:
+            return []
+        entries, self._entries = self._entries, []
+        return entries
+
+
+class _BaseAIAgentClient:
+    """
+    Configuration, caching and request building shared by the sync and async clients
     """
     
-    def __init__(self, api_key: str, base_url: str = "https://your-domain.com/api/v1", timeout: int = 30):
+    def __init__(self, api_key: str, base_url: str = "https://your-domain.com/api/v1", timeout: int = 30,
+                 cache_backend: Optional[Any] = None, cache_size: int = 4096):
         """
         Initialize the client
         
@@ -30,22 +189,224 @@ class AIAgentClient:
             api_key: Your API key
             base_url: Base URL for the API
             timeout: Request timeout in seconds
+            cache_backend: Optional shared cache behind the in-process one
+                (anything with get/setex, e.g. redis.Redis)
+            cache_size: Maximum responses kept in the in-process cache
         """
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'X-API-Key': api_key
-        })
+        # Fixed endpoints are built once; only analytics needs a per-call query string
+        self._post_url = self.base_url
+        self._providers_url = self.base_url + "?action=providers"
+        self._info_url = self.base_url + "?action=info"
+        self._local_cache = LRUCache(cache_size)
+        self.cache = cache_backend
+    
+    def _client_options(self) -> Dict[str, Any]:
+        # HTTP/2 multiplexes concurrent requests to the API over one TLS connection
+        return {
+            'http2': True,
+            'headers': {
+                'Content-Type': 'application/json',
+                'X-API-Key': self.api_key
+            },
+            'timeout': httpx.Timeout(self.timeout, connect=3.0, write=10.0, pool=5.0),
+            'limits': httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        }
+    
+    @staticmethod
+    def _cache_key(data: Dict) -> str:
+        return "onchain_agent:" + hashlib.blake2b(
+            orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).hexdigest()
+    
+    @staticmethod
+    def _cache_hit(value: bytes) -> Dict[str, Any]:
+        # Decoded per caller so nobody shares a mutable dict; `data` is the original
+        # response, so no new payment was made for it
+        result = orjson.loads(value)
+        result['cached'] = True
+        return result
+    
+    @staticmethod
+    def _optimize_data(prompt: str, wallet_address: str, provider: Optional[str], max_cost: Optional[float]) -> Dict[str, Any]:
+        if not prompt:
+            raise ValueError("prompt is required")
+        if not wallet_address:
+            raise ValueError("wallet_address is required")
+        
+        data = {
+            'action': 'optimize',
+            'prompt': prompt,
+            'walletAddress': wallet_address
+        }
+        
+        if provider:
+            data['provider'] = provider
+        if max_cost is not None:
+            data['maxCost'] = max_cost
+        
+        return data
+    
+    @staticmethod
+    def _chat_data(message: str, wallet_address: str) -> Dict[str, Any]:
+        if not message:
+            raise ValueError("message is required")
+        if not wallet_address:
+            raise ValueError("wallet_address is required")
+        
+        return {
+            'action': 'chat',
+            'message': message,
+            'walletAddress': wallet_address
+        }
+    
+    @staticmethod
+    def _chat_batches(messages: List[str], wallet_address: str, batch_size: int) -> Iterator[Dict[str, Any]]:
+        if not messages:
+            raise ValueError("messages is required")
+        if not wallet_address:
+            raise ValueError("wallet_address is required")
+        _check_batch_size(batch_size)
+        
+        for start in range(0, len(messages), batch_size):
+            yield {
+                'action': 'chat_batch',
+                'messages': messages[start:start + batch_size],
+                'walletAddress': wallet_address
+            }
+    
+    @staticmethod
+    def _wallet_data(wallet_address: str, signature: Optional[str]) -> Dict[str, Any]:
+        if not wallet_address:
+            raise ValueError("wallet_address is required")
+        
+        data = {
+            'action': 'wallet',
+            'walletAddress': wallet_address
+        }
+        
+        if signature:
+            data['signature'] = signature
+        
+        return data
+    
+    def _analytics_url(self, wallet_address: str) -> str:
+        if not wallet_address:
+            raise ValueError("wallet_address is required")
+        
+        return self.base_url + "?" + urlencode({'action': 'analytics', 'walletAddress': wallet_address})
+
+
+class AIAgentClient(_BaseAIAgentClient):
+    """
+    Python client for OnChain Agent API
+    
+    Provides easy integration with AI agent cost optimization
+    and x402 micropayment protocol.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client = httpx.Client(**self._client_options())
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """
+        Close pooled connections
+        """
+        self.client.close()
+    
+    def __enter__(self) -> "AIAgentClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _cached_request(self, data: Dict, ttl: int, use_cache: bool) -> Dict[str, Any]:
+        """
+        POST data, serving repeated identical requests from cache
+        
+        Concurrent identical requests share a single API call. Responses that did
+        not come from a new API call (cache hits and shared calls) have
+        ``cached=True`` set.
+        
+        Args:
+            data: Request data
+            ttl: Cache lifetime in seconds for a successful response
+            use_cache: Whether to read from and write to the cache
+            
+        Returns:
+            API response data
+        """
+        if not use_cache:
+            return self._make_request(self._post_url, 'POST', data)
+        
+        key = self._cache_key(data)
+        
+        cached = self._local_cache.get(key)
+        if cached is None:
+            cached = self._backend_get(key)
+            if cached is not None:
+                self._local_cache.setex(key, ttl, cached)
+        if cached is not None:
+            return self._cache_hit(cached)
+        
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is None:
+                # The previous leader may have finished between the lookup above and here
+                cached = self._local_cache.get(key)
+                if cached is not None:
+                    return self._cache_hit(cached)
+                leader_future = self._inflight[key] = Future()
+            else:
+                leader_future = None
+        
+        if leader_future is None:
+            return self._cache_hit(future.result())
+        
+        try:
+            result = self._make_request(self._post_url, 'POST', data)
+            value = orjson.dumps(result)
+            if result.get('success', False):
+                self._local_cache.setex(key, ttl, value)
+                self._backend_setex(key, ttl, value)
+            leader_future.set_result(value)
+            return result
+        except BaseException as e:
+            leader_future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
     
-    def _make_request(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None) -> Dict[str, Any]:
+    # The shared cache backend is best-effort: if it is unavailable requests go to the
+    # API, and a response that was already paid for is always returned
+    def _backend_get(self, key: str) -> Optional[bytes]:
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(key)
+        except Exception:
+            return None
+    
+    def _backend_setex(self, key: str, ttl: int, value: bytes) -> None:
+        if self.cache is None:
+            return
+        try:
+            self.cache.setex(key, ttl, value)
+        except Exception:
+            pass
+    
+    def _make_request(self, url: str, method: str = 'GET', data: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Make authenticated API request
         
         Args:
-            endpoint: API endpoint
+            url: Full API URL
             method: HTTP method
             data: Request data
             
@@ -53,40 +414,21 @@ class AIAgentClient:
             API response data
             
         Raises:
-            requests.RequestException: If request fails
+            httpx.RequestError: If request fails
             ValueError: If response contains error
         """
-        url = f"{self.base_url}{endpoint}" if not endpoint.startswith('http') else endpoint
-        
-        try:
+        with _api_errors():
             if method.upper() == 'GET':
-                response = self.session.get(url, timeout=self.timeout)
+                response = self.client.get(url)
             elif method.upper() == 'POST':
-                response = self.session.post(url, json=data, timeout=self.timeout)
+                response = self.client.post(url, content=orjson.dumps(data))
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
-            response.raise_for_status()
-            result = response.json()
-            
-            if not result.get('success', False):
-                raise ValueError(result.get('error', 'Unknown API error'))
-            
-            return result
-            
-        except requests.exceptions.Timeout:
-            raise requests.RequestException("Request timeout: API did not respond in time")
-        except requests.exceptions.ConnectionError:
-            raise requests.RequestException("Connection error: Unable to connect to API")
-        except requests.exceptions.HTTPError as e:
-            try:
-                error_data = e.response.json()
-                error_msg = error_data.get('error', f"HTTP {e.response.status_code}")
-            except:
-                error_msg = f"HTTP {e.response.status_code}: {e.response.reason}"
-            raise ValueError(error_msg)
+            return _parse_response(response)
     
-    def optimize(self, prompt: str, wallet_address: str, provider: Optional[str] = None, max_cost: Optional[float] = None) -> Dict[str, Any]:
+    def optimize(self, prompt: str, wallet_address: str, provider: Optional[str] = None, max_cost: Optional[float] = None,
+                 cache: bool = True) -> Dict[str, Any]:
         """
         Optimize AI agent costs using x402 protocol
         
@@ -95,6 +437,7 @@ class AIAgentClient:
             wallet_address: Your wallet address for micropayments
             provider: AI provider (openai, anthropic, perplexity)
             max_cost: Maximum cost in USD
+            cache: Serve identical repeat requests from cache (marked cached=True)
             
         Returns:
             Optimization result with savings information
@@ -102,31 +445,17 @@ class AIAgentClient:
         Raises:
             ValueError: If required parameters are missing or API returns error
         """
-        if not prompt:
-            raise ValueError("prompt is required")
-        if not wallet_address:
-            raise ValueError("wallet_address is required")
-        
-        data = {
-            'action': 'optimize',
-            'prompt': prompt,
-            'walletAddress': wallet_address
-        }
-        
-        if provider:
-            data['provider'] = provider
-        if max_cost is not None:
-            data['maxCost'] = max_cost
-        
-        return self._make_request('', 'POST', data)
+        data = self._optimize_data(prompt, wallet_address, provider, max_cost)
+        return self._cached_request(data, OPTIMIZE_CACHE_TTL, cache)
     
-    def chat(self, message: str, wallet_address: str) -> Dict[str, Any]:
+    def chat(self, message: str, wallet_address: str, cache: bool = True) -> Dict[str, Any]:
         """
         Chat with AI through cost-optimized routing
         
         Args:
             message: Your message
             wallet_address: Your wallet address
+            cache: Serve identical repeat requests from cache (marked cached=True)
             
         Returns:
             Chat response with cost information
@@ -134,18 +463,30 @@ class AIAgentClient:
         Raises:
             ValueError: If required parameters are missing or API returns error
         """
-        if not message:
-            raise ValueError("message is required")
-        if not wallet_address:
-            raise ValueError("wallet_address is required")
+        data = self._chat_data(message, wallet_address)
+        return self._cached_request(data, CHAT_CACHE_TTL, cache)
+    
+    def chat_many(self, messages: List[str], wallet_address: str, batch_size: int = MAX_CHAT_BATCH_SIZE) -> List[Dict[str, Any]]:
+        """
+        Chat with many messages using one request per batch
         
-        data = {
-            'action': 'chat',
-            'message': message,
-            'walletAddress': wallet_address
-        }
+        Args:
+            messages: Your messages
+            wallet_address: Your wallet address
+            batch_size: Maximum messages per request (1 to 32, the server limit)
+            
+        Returns:
+            One chat response per message, in order. Each item has the same
+            shape as a chat() response; failed items have success=False.
+            
+        Raises:
+            ValueError: If required parameters are missing or API returns error
+        """
+        results = []
+        for data in self._chat_batches(messages, wallet_address, batch_size):
+            results.extend(self._make_request(self._post_url, 'POST', data)['data']['results'])
         
-        return self._make_request('', 'POST', data)
+        return results
     
     def connect_wallet(self, wallet_address: str, signature: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -161,18 +502,7 @@ class AIAgentClient:
         Raises:
             ValueError: If required parameters are missing or API returns error
         """
-        if not wallet_address:
-            raise ValueError("wallet_address is required")
-        
-        data = {
-            'action': 'wallet',
-            'walletAddress': wallet_address
-        }
-        
-        if signature:
-            data['signature'] = signature
-        
-        return self._make_request('', 'POST', data)
+        return self._make_request(self._post_url, 'POST', self._wallet_data(wallet_address, signature))
     
     def get_analytics(self, wallet_address: str) -> Dict[str, Any]:
         """
@@ -187,11 +517,36 @@ class AIAgentClient:
         Raises:
             ValueError: If required parameters are missing or API returns error
         """
-        if not wallet_address:
-            raise ValueError("wallet_address is required")
+        return self._make_request(self._analytics_url(wallet_address))
+    
+    def iter_analytics_history(self, wallet_address: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream optimization history entries without loading the whole analytics payload
         
-        endpoint = f"?action=analytics&walletAddress={requests.utils.quote(wallet_address)}"
-        return self._make_request(endpoint)
+        Entries are parsed and yielded as the response body arrives, so
+        memory stays flat for wallets with a long history.
+        Requires: pip install ijson
+        
+        Args:
+            wallet_address: Your wallet address
+            
+        Yields:
+            One optimizationHistory entry (date, saved, calls) at a time
+            
+        Raises:
+            ValueError: If required parameters are missing, the API returns an
+                error or the response body is malformed
+        """
+        url = self._analytics_url(wallet_address)
+        parser = _HistoryParser()
+        
+        with _api_errors(), self.client.stream('GET', url) as response:
+            if response.is_error:
+                response.read()  # let _api_errors report the error body
+                response.raise_for_status()
+            for chunk in response.iter_bytes():
+                yield from parser.feed(chunk)
+        yield from parser.close()
     
     def get_providers(self) -> Dict[str, Any]:
         """
@@ -203,7 +558,7 @@ class AIAgentClient:
         Raises:
             ValueError: If API returns error
         """
-        return self._make_request('?action=providers')
+        return self._make_request(self._providers_url)
     
     def get_info(self) -> Dict[str, Any]:
         """
@@ -215,7 +570,316 @@ class AIAgentClient:
         Raises:
             ValueError: If API returns error
         """
-        return self._make_request('?action=info')
+        return self._make_request(self._info_url)
+
+
+class AsyncAIAgentClient(_BaseAIAgentClient):
+    """
+    asyncio client for OnChain Agent API
+    
+    Same methods as AIAgentClient, as coroutines. Concurrent calls share
+    one HTTP/2 connection. cache_backend may be a sync or asyncio client
+    (e.g. redis.asyncio.Redis).
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client = httpx.AsyncClient(**self._client_options())
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def aclose(self) -> None:
+        """
+        Close pooled connections
+        """
+        await self.client.aclose()
+    
+    async def __aenter__(self) -> "AsyncAIAgentClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def _cached_request(self, data: Dict, ttl: int, use_cache: bool) -> Dict[str, Any]:
+        """
+        POST data, serving repeated identical requests from cache
+        
+        Concurrent identical requests share a single API call. Responses that did
+        not come from a new API call (cache hits and shared calls) have
+        ``cached=True`` set.
+        """
+        if not use_cache:
+            return await self._make_request(self._post_url, 'POST', data)
+        
+        key = self._cache_key(data)
+        
+        cached = self._local_cache.get(key)
+        if cached is None:
+            cached = await self._backend_get(key)
+            if cached is not None:
+                self._local_cache.setex(key, ttl, cached)
+        if cached is not None:
+            return self._cache_hit(cached)
+        
+        future = self._inflight.get(key)
+        while future is not None:
+            # Shield so a cancelled waiter does not cancel the shared request
+            value = await asyncio.shield(future)
+            if value is not None:
+                return self._cache_hit(value)
+            # The leader was cancelled: the first waiter to resume sends the request
+            future = self._inflight.get(key)
+        
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await self._make_request(self._post_url, 'POST', data)
+            value = orjson.dumps(result)
+            if result.get('success', False):
+                self._local_cache.setex(key, ttl, value)
+                await self._backend_setex(key, ttl, value)
+            future.set_result(value)
+            return result
+        except asyncio.CancelledError:
+            # Only this task was cancelled; wake the waiters so one of them takes over
+            future.set_result(None)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved so asyncio does not warn when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+    
+    # Best-effort like AIAgentClient's; backends may be sync or async (e.g. redis.asyncio)
+    async def _backend_get(self, key: str) -> Optional[bytes]:
+        if self.cache is None:
+            return None
+        try:
+            cached = self.cache.get(key)
+            if inspect.isawaitable(cached):
+                cached = await cached
+            return cached
+        except Exception:
+            return None
+    
+    async def _backend_setex(self, key: str, ttl: int, value: bytes) -> None:
+        if self.cache is None:
+            return
+        try:
+            stored = self.cache.setex(key, ttl, value)
+            if inspect.isawaitable(stored):
+                await stored
+        except Exception:
+            pass
+    
+    async def _make_request(self, url: str, method: str = 'GET', data: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Make authenticated API request
+        
+        Raises:
+            httpx.RequestError: If request fails
+            ValueError: If response contains error
+        """
+        with _api_errors():
+            if method.upper() == 'GET':
+                response = await self.client.get(url)
+            elif method.upper() == 'POST':
+                response = await self.client.post(url, content=orjson.dumps(data))
+            else:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+            
+            return _parse_response(response)
+    
+    async def optimize(self, prompt: str, wallet_address: str, provider: Optional[str] = None,
+                       max_cost: Optional[float] = None, cache: bool = True) -> Dict[str, Any]:
+        """
+        Optimize AI agent costs using x402 protocol (see AIAgentClient.optimize)
+        """
+        data = self._optimize_data(prompt, wallet_address, provider, max_cost)
+        return await self._cached_request(data, OPTIMIZE_CACHE_TTL, cache)
+    
+    async def chat(self, message: str, wallet_address: str, cache: bool = True) -> Dict[str, Any]:
+        """
+        Chat with AI through cost-optimized routing (see AIAgentClient.chat)
+        """
+        data = self._chat_data(message, wallet_address)
+        return await self._cached_request(data, CHAT_CACHE_TTL, cache)
+    
+    async def chat_many(self, messages: List[str], wallet_address: str, batch_size: int = MAX_CHAT_BATCH_SIZE) -> List[Dict[str, Any]]:
+        """
+        Chat with many messages, sending all batches concurrently (see AIAgentClient.chat_many)
+        """
+        responses = await asyncio.gather(*[
+            self._make_request(self._post_url, 'POST', data)
+            for data in self._chat_batches(messages, wallet_address, batch_size)
+        ])
+        return [item for response in responses for item in response['data']['results']]
+    
+    async def connect_wallet(self, wallet_address: str, signature: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Connect wallet for micropayments (see AIAgentClient.connect_wallet)
+        """
+        return await self._make_request(self._post_url, 'POST', self._wallet_data(wallet_address, signature))
+    
+    async def get_analytics(self, wallet_address: str) -> Dict[str, Any]:
+        """
+        Get cost analytics and savings reports (see AIAgentClient.get_analytics)
+        """
+        return await self._make_request(self._analytics_url(wallet_address))
+    
+    async def iter_analytics_history(self, wallet_address: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream optimization history entries (see AIAgentClient.iter_analytics_history)
+        """
+        url = self._analytics_url(wallet_address)
+        parser = _HistoryParser()
+        
+        with _api_errors():
+            async with self.client.stream('GET', url) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    for entry in parser.feed(chunk):
+                        yield entry
+        for entry in parser.close():
+            yield entry
+    
+    async def get_providers(self) -> Dict[str, Any]:
+        """
+        Get available AI providers and pricing information
+        """
+        return await self._make_request(self._providers_url)
+    
+    async def get_info(self) -> Dict[str, Any]:
+        """
+        Get API information and available endpoints
+        """
+        return await self._make_request(self._info_url)
+
+
+class ChatBatcher:
+    """
+    Coalesces concurrent chat calls into chat_batch requests
+    
+    Calls submitted from many threads within flush_ms of each other (up to
+    batch_size) are sent as a single request, and each caller receives its
+    own slice of the response.
+    """
+    
+    def __init__(self, client: AIAgentClient, batch_size: int = MAX_CHAT_BATCH_SIZE, flush_ms: float = 10):
+        """
+        Initialize the batcher
+        
+        Args:
+            client: Client used to send the batched requests
+            batch_size: Maximum messages per request (1 to 32)
+            flush_ms: How long to wait for more messages before sending
+        """
+        _check_batch_size(batch_size)
+        
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+    
+    def submit(self, message: str, wallet_address: str) -> Future:
+        """
+        Queue a message and return a Future resolving to its chat response
+        """
+        if not message:
+            raise ValueError("message is required")
+        if not wallet_address:
+            raise ValueError("wallet_address is required")
+        
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ChatBatcher is closed")
+            self._queue.put((message, wallet_address, future))
+        return future
+    
+    def chat(self, message: str, wallet_address: str) -> Dict[str, Any]:
+        """
+        Same as AIAgentClient.chat, but sent as part of a batch
+        """
+        return self.submit(message, wallet_address).result()
+    
+    def close(self) -> None:
+        """
+        Flush pending messages and stop the background worker
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+    
+    def __enter__(self) -> "ChatBatcher":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _run(self) -> None:
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is None:
+                return
+            
+            # Futures the caller already cancelled are dropped so they are never sent (or paid for)
+            pending = [item] if item[2].set_running_or_notify_cancel() else []
+            deadline = time.monotonic() + self.flush_interval
+            while len(pending) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                if item[2].set_running_or_notify_cancel():
+                    pending.append(item)
+            
+            if pending:
+                self._flush(pending)
+    
+    def _flush(self, pending: List[tuple]) -> None:
+        by_wallet: Dict[str, List[tuple]] = {}
+        for item in pending:
+            by_wallet.setdefault(item[1], []).append(item)
+        
+        for wallet_address, items in by_wallet.items():
+            # A failure only fails this batch's futures; the worker keeps serving later calls
+            try:
+                self._send(wallet_address, items)
+            except Exception as e:
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+    
+    def _send(self, wallet_address: str, items: List[tuple]) -> None:
+        results = self.client.chat_many([message for message, _, _ in items], wallet_address, self.batch_size)
+        
+        for (_, _, future), result in zip(items, results):
+            if not isinstance(result, dict):
+                future.set_exception(ValueError(f"Invalid result returned for message: {result!r}"))
+            elif result.get('success', False):
+                future.set_result(result)
+            else:
+                future.set_exception(ValueError(result.get('error', 'Unknown API error')))
+        for _, _, future in items[len(results):]:
+            future.set_exception(ValueError("No result returned for message"))
+
 
 
 # Convenience functions for quick usage
@@ -234,8 +898,8 @@ def optimize_costs(api_key: str, prompt: str, wallet_address: str, provider: Opt
     Returns:
         Optimization result
     """
-    client = AIAgentClient(api_key, **kwargs)
-    return client.optimize(prompt, wallet_address, provider, max_cost)
+    with AIAgentClient(api_key, **kwargs) as client:
+        return client.optimize(prompt, wallet_address, provider, max_cost)
 
 
 def chat_with_ai(api_key: str, message: str, wallet_address: str, **kwargs) -> Dict[str, Any]:
@@ -251,8 +915,8 @@ def chat_with_ai(api_key: str, message: str, wallet_address: str, **kwargs) -> D
     Returns:
         Chat response
     """
-    client = AIAgentClient(api_key, **kwargs)
-    return client.chat(message, wallet_address)
+    with AIAgentClient(api_key, **kwargs) as client:
+        return client.chat(message, wallet_address)
 
 
 def get_analytics(api_key: str, wallet_address: str, **kwargs) -> Dict[str, Any]:
@@ -267,8 +931,8 @@ def get_analytics(api_key: str, wallet_address: str, **kwargs) -> Dict[str, Any]
     Returns:
         Analytics data
     """
-    client = AIAgentClient(api_key, **kwargs)
-    return client.get_analytics(wallet_address)
+    with AIAgentClient(api_key, **kwargs) as client:
+        return client.get_analytics(wallet_address)
 
 
 # Example usage
@@ -306,7 +970,7 @@ if __name__ == "__main__":
         
     except ValueError as e:
         print(f"API Error: {e}")
-    except requests.RequestException as e:
+    except httpx.RequestError as e:
         print(f"Network Error: {e}")
     
     # Example 2: Using convenience functions
@@ -321,5 +985,5 @@ if __name__ == "__main__":
         
         print(f"Quick optimization savings: {quick_result['data']['savingsPercentage']:.1f}%")
         
-    except (ValueError, requests.RequestException) as e:
+    except (ValueError, httpx.RequestError) as e:
         print(f"Error: {e}")
@@ -11,6 +11,7 @@ import { NextRequest, NextResponse } from 'next/server';
  * Available endpoints:
  * - POST /api/v1/optimize - Optimize AI agent costs
  * - POST /api/v1/chat - Chat with AI through x402 protocol
+ * - POST /api/v1/chat_batch - Chat with many messages in a single request
  * - GET /api/v1/analytics - Get cost analytics and savings
  * - GET /api/v1/providers - Get available AI providers and pricing
  * - POST /api/v1/wallet - Connect wallet for micropayments
@@ -37,6 +38,11 @@ import { initializeAgentKit } from '@/lib/agentkit';
 const responseCache = new Map<string, { response: any; timestamp: number; cost: number }>();
 const CACHE_TTL = 5 * 60 * 1000; // 5 minutes
 
+// Upper bound on messages accepted by a single chat_batch request
+const MAX_CHAT_BATCH_SIZE = 32;
+// How many messages of one chat_batch request are sent to AI providers at a time
+const CHAT_BATCH_CONCURRENCY = 4;
+
 // Initialize X402 SDK and AgentKit
 const x402Config = {
   baseUrl: 'https://api.onchain-agent.com',
@@ -325,6 +331,13 @@ export async function GET(req: NextRequest) {
             walletAddress: 'string - Your wallet address'
           }
         },
+        'POST /chat_batch': {
+          description: `Chat with up to ${MAX_CHAT_BATCH_SIZE} messages in one request (each message counts against the rate limit)`,
+          parameters: {
+            messages: 'string[] - Your messages',
+            walletAddress: 'string - Your wallet address'
+          }
+        },
         'GET /analytics': {
           description: 'Get cost analytics and savings reports',
           parameters: {
@@ -649,6 +662,39 @@ export async function POST(req: NextRequest) {
         }
         break;
       
+      case 'chat_batch': {
+        // Each message is a paid AI call, so it counts against the IP rate limit like a
+        // separate request (the request itself was already counted once above)
+        const batchSize = Array.isArray(data.messages) ? data.messages.length : 0;
+        if (batchSize > 1 && batchSize <= MAX_CHAT_BATCH_SIZE && !checkIPRateLimit(req, batchSize - 1).allowed) {
+          logSecurityEvent('rate_limit_exceeded', {
+            ip: clientIP,
+            userAgent,
+            endpoint: 'POST /api/v1 - chat_batch',
+            timestamp: new Date().toISOString()
+          });
+          
+          const response = NextResponse.json(
+            createResponse(null, false, 'Rate limit exceeded. Try again later.'),
+            { status: 429 }
+          );
+          return addSecurityHeaders(response);
+        }
+        
+        result = await handleChatBatch(data);
+        endpoint = 'chat_batch';
+        if (result.success && result.data) {
+          for (const item of result.data.results) {
+            if (item.success && item.data) {
+              cost += item.data.cost || 0;
+            }
+          }
+          saved = 0;
+          provider = 'batch';
+        }
+        break;
+      }
+      
       case 'wallet':
         result = await handleWallet(data);
         endpoint = 'wallet';
@@ -659,7 +705,7 @@ export async function POST(req: NextRequest) {
       
       default:
         return NextResponse.json(
-          createResponse(null, false, 'Invalid action. Available: optimize, chat, wallet'),
+          createResponse(null, false, 'Invalid action. Available: optimize, chat, chat_batch, wallet'),
           { status: 400 }
         );
     }
@@ -1023,6 +1069,42 @@ async function handleChat(data: any) {
   }
 }
 
+// Handle batched chat requests (one auth/routing pass for many messages)
+async function handleChatBatch(data: any) {
+  const { messages, walletAddress } = data;
+
+  if (!Array.isArray(messages) || messages.length === 0) {
+    return {
+      success: false,
+      error: 'messages must be a non-empty array'
+    };
+  }
+
+  if (messages.length > MAX_CHAT_BATCH_SIZE) {
+    return {
+      success: false,
+      error: `messages exceeds the batch limit of ${MAX_CHAT_BATCH_SIZE}`
+    };
+  }
+
+  // Bounded concurrency: at most CHAT_BATCH_CONCURRENCY provider/x402 calls in flight
+  const results: any[] = [];
+  for (let start = 0; start < messages.length; start += CHAT_BATCH_CONCURRENCY) {
+    const chunk = messages.slice(start, start + CHAT_BATCH_CONCURRENCY);
+    results.push(...await Promise.all(
+      chunk.map((message: string) => handleChat({ message, walletAddress }))
+    ));
+  }
+
+  return {
+    success: true,
+    data: {
+      results,
+      count: results.length
+    }
+  };
+}
+
 // Handle wallet connection
 async function handleWallet(data: any) {
   const { walletAddress, signature } = data;
@@ -1,14 +1,164 @@
+from __future__ import annotations
+
 import dspy
-from gepa import GEPA
-from gepa.adapters.dspy_full_program_adapter import DSPyFullProgramAdapter
-import pandas as pd
-import json
-from typing import Dict, List, Any
-import numpy as np
+import orjson
+import contextvars
+import functools
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence, Union
+
+# gepa, pandas and numpy are imported inside the functions that use them so that
+# importing PaymentRouter or the metric stays fast
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+lm = None
+
+def _configure_lm():
+    """Configure DSPy with Perplexity (your existing backend) on first use."""
+    global lm
+    if lm is None:
+        lm = dspy.Perplexity(model='pplx-70b-online')
+        dspy.settings.configure(lm=lm)
+    return lm
+
+class LMDiskCache:
+    """
+    SQLite store for predictor outputs so re-running the evolution reuses earlier LM calls.
+    Entries expire after ttl seconds (one week by default).
+    """
+    
+    def __init__(self, path: str = "~/.onchain_agent/lm_cache.sqlite3", ttl: float = 7 * 86400):
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use so importing this module never touches the disk
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS lm_cache (key TEXT PRIMARY KEY, response BLOB, expires_at REAL)"
+            )
+            self._connection.execute("DELETE FROM lm_cache WHERE expires_at <= ?", (time.time(),))
+            self._connection.commit()
+        return self._connection
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT response FROM lm_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return orjson.loads(row[0]) if row else None
+    
+    def set(self, key: str, outputs: Dict[str, Any]) -> None:
+        response = orjson.dumps(outputs, default=str)
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO lm_cache (key, response, expires_at) VALUES (?, ?, ?)",
+                (key, response, time.time() + self.ttl)
+            )
+            connection.commit()
+
+def _lm_name() -> str:
+    """Name of the configured LM, so switching models never serves another model's answers."""
+    current = dspy.settings.lm
+    model = getattr(current, "model", None) or getattr(current, "kwargs", {}).get("model")
+    return f"{type(current).__name__}:{model}"
+
+def memoize_lm(maxsize: int = 8192, disk_cache: Optional[LMDiskCache] = None) -> Callable:
+    """
+    Memoize predictor calls in an LRU keyed by the configured LM, the predictor's current
+    prompt and its inputs, optionally backed by a disk cache that survives across runs.
+    GEPA re-evaluates many identical sub-prompts while evolving, so hits skip the LM entirely.
+    """
+    def decorator(call: Callable) -> Callable:
+        cache: "OrderedDict[str, dspy.Prediction]" = OrderedDict()
+        lock = threading.Lock()
+        
+        def remember(key: str, prediction: dspy.Prediction) -> None:
+            with lock:
+                cache[key] = prediction
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+        
+        @functools.wraps(call)
+        def wrapper(predictor: dspy.Module, **inputs) -> dspy.Prediction:
+            # str(predictor) renders its signature and instructions, so evolved prompts get new keys
+            key = hashlib.blake2b(
+                _lm_name().encode() + b"\0" + str(predictor).encode()
+                + orjson.dumps(inputs, option=orjson.OPT_SORT_KEYS, default=str),
+                digest_size=16
+            ).hexdigest()
+            
+            with lock:
+                prediction = cache.get(key)
+                if prediction is not None:
+                    cache.move_to_end(key)
+                    # Callers may annotate the prediction, so each hit gets its own copy
+                    prediction = dspy.Prediction(**prediction.toDict())
+            
+            if prediction is None and disk_cache is not None:
+                outputs = disk_cache.get(key)
+                if outputs is not None:
+                    prediction = dspy.Prediction(**outputs)
+                    remember(key, dspy.Prediction(**outputs))
+            
+            if prediction is not None:
+                # Record the step as the predictor itself would, so trace-based reflection still sees it
+                if dspy.settings.trace is not None:
+                    dspy.settings.trace.append((getattr(predictor, "predict", predictor), inputs, prediction))
+                return prediction
+            
+            prediction = call(predictor, **inputs)
+            outputs = prediction.toDict()
+            remember(key, dspy.Prediction(**outputs))
+            if disk_cache is not None:
+                disk_cache.set(key, outputs)
+            return prediction
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+def _default_lm_disk_cache() -> Optional[LMDiskCache]:
+    """
+    Disk cache for _call_predictor. ONCHAIN_AGENT_LM_CACHE overrides its path;
+    setting it to an empty string, "0" or "off" disables the disk cache.
+    """
+    path = os.environ.get("ONCHAIN_AGENT_LM_CACHE")
+    if path is None:
+        return LMDiskCache()
+    if path.strip().lower() in ("", "0", "off", "false", "none"):
+        return None
+    return LMDiskCache(path)
+
+@memoize_lm(disk_cache=_default_lm_disk_cache())
+def _call_predictor(predictor: dspy.Module, **inputs) -> dspy.Prediction:
+    return predictor(**inputs)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
 
-# Configure DSPy with Perplexity (your existing backend)
-lm = dspy.Perplexity(model='pplx-70b-online')
-dspy.settings.configure(lm=lm)
+def _router_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by every PaymentRouter.forward, created on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # Two background calls per forward; headroom for concurrent evaluation threads
+                _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="payment-router")
+    return _executor
 
 class PaymentRouter(dspy.Module):
     """
@@ -36,34 +186,50 @@ class PaymentRouter(dspy.Module):
         """
         Evolves the complete micropayment and cost optimization workflow.
         """
-        # Analyze cost and rail options
-        cost_analysis = self.analyze_cost(
-            amount=str(amount),
-            currency=currency,
-            urgency=urgency
-        )
+        # Only route optimization depends on another step (cost analysis), so the
+        # x402 and discount LM calls run in the background while that chain runs here.
+        # Each task gets a copy of the caller's context so dspy settings and traces carry over.
+        pool = _router_executor()
         
         # Negotiate x402 micropayment
-        x402_negotiation = self.x402_negotiate(
+        x402_future = pool.submit(
+            contextvars.copy_context().run,
+            _call_predictor,
+            self.x402_negotiate,
             query_cost=str(query_cost),
             provider="Perplexity",
             user_balance=str(user_balance)
         )
         
         # Optimize discounts and early payment
-        discount_optimization = self.optimize_discount(
+        discount_future = pool.submit(
+            contextvars.copy_context().run,
+            _call_predictor,
+            self.optimize_discount,
             invoice_details=invoice_details,
             payment_terms="standard"
         )
         
+        # Analyze cost and rail options
+        cost_analysis = _call_predictor(
+            self.analyze_cost,
+            amount=str(amount),
+            currency=currency,
+            urgency=urgency
+        )
+        
         # Route optimization
-        route_optimization = self.route_optimization(
+        route_optimization = _call_predictor(
+            self.route_optimization,
             available_rails=cost_analysis.rail_options,
             fees=cost_analysis.predicted_fees,
             timing=urgency
         )
         
-        return dspy.Prediction(
+        x402_negotiation = x402_future.result()
+        discount_optimization = discount_future.result()
+        
+        outputs = dict(
             recommended_rail=cost_analysis.recommendation,
             micro_payment=x402_negotiation.micro_amount,
             total_savings=discount_optimization.savings_estimate,
@@ -72,6 +238,11 @@ class PaymentRouter(dspy.Module):
             execution_plan=route_optimization.execution_plan,
             risk_assessment=discount_optimization.risk_assessment
         )
+        
+        # Estimate output tokens (~4 chars each) once here so metrics don't have to repr the prediction
+        token_count = sum(len(str(value)) for value in outputs.values()) // 4
+        
+        return dspy.Prediction(token_count=token_count, **outputs)
 
 class CostAwareEfficiencyMetric:
     """
@@ -82,41 +253,96 @@ class CostAwareEfficiencyMetric:
     def __init__(self, target_savings_threshold: float = 0.3):
         self.target_savings_threshold = target_savings_threshold
     
-    def __call__(self, example: Dict, prediction: dspy.Prediction, trace: Any) -> float:
+    def __call__(self, example: Dict, prediction: dspy.Prediction, trace: Any = None) -> float:
         """
         Calculate cost-aware efficiency score.
         Higher score = better optimization (more savings, fewer tokens).
         """
-        try:
-            # Extract savings from prediction
-            savings = float(prediction.total_savings.replace('$', '').replace(',', ''))
-            target_savings = float(example.get('target_savings', 0))
-            
-            # Calculate savings accuracy
-            savings_accuracy = min(savings / max(target_savings, 1), 1.0)
-            
-            # Calculate token efficiency (fewer tokens = better)
-            token_count = len(str(prediction))
-            token_efficiency = 1.0 / (1.0 + token_count / 1000)  # Normalize
-            
-            # Calculate cost efficiency
-            cost_efficiency = savings_accuracy * 0.7 + token_efficiency * 0.3
-            
-            # Bonus for meeting savings threshold
-            if savings >= target_savings * self.target_savings_threshold:
-                cost_efficiency += 0.2
-            
-            return min(cost_efficiency, 1.0)
-            
-        except (ValueError, AttributeError):
-            return 0.0
+        return float(self.score_many([example], [prediction])[0])
+    
+    def score_many(self, examples: Union[pd.DataFrame, Sequence[Dict]],
+                   predictions: Sequence[dspy.Prediction]) -> np.ndarray:
+        """
+        Score a whole evaluation batch at once.
+        Returns one score per example; unparseable examples score 0.0.
+        """
+        import numpy as np
+        
+        if len(examples) != len(predictions):
+            raise ValueError(
+                f"Got {len(examples)} examples but {len(predictions)} predictions"
+            )
+        
+        # Parse inputs once into arrays (NaN marks an unparseable value)
+        if not isinstance(examples, Sequence):
+            # DataFrame: use the target_savings column directly
+            target_savings = np.asarray(examples["target_savings"], dtype=float)
+        else:
+            target_savings = np.array([_parse_target_savings(example) for example in examples], dtype=float)
+        savings = np.array([_parse_savings(prediction) for prediction in predictions], dtype=float)
+        token_counts = np.array([_token_count(prediction) for prediction in predictions], dtype=float)
+        
+        # Calculate savings accuracy
+        savings_accuracy = np.minimum(savings / np.maximum(target_savings, 1), 1.0)
+        
+        # Calculate token efficiency (fewer tokens = better)
+        token_efficiency = 1.0 / (1.0 + token_counts / 1000)  # Normalize
+        
+        # Calculate cost efficiency
+        cost_efficiency = savings_accuracy * 0.7 + token_efficiency * 0.3
+        
+        # Bonus for meeting savings threshold
+        cost_efficiency += 0.2 * (savings >= target_savings * self.target_savings_threshold)
+        
+        scores = np.minimum(cost_efficiency, 1.0)
+        scores[np.isnan(savings) | np.isnan(target_savings)] = 0.0
+        return scores
+
+# Deletes '$' and ',' in a single pass over the string
+_STRIP_CURRENCY = str.maketrans("", "", "$,")
+
+def _parse_savings(prediction: dspy.Prediction) -> float:
+    """Extract savings from a prediction, NaN if it cannot be parsed."""
+    try:
+        return float(prediction.total_savings.translate(_STRIP_CURRENCY))
+    except (ValueError, AttributeError):
+        return float("nan")
+
+def _parse_target_savings(example: Dict) -> float:
+    """Extract target savings from an example, NaN if it cannot be parsed."""
+    # Indexing works for dicts, dspy.Example, pd.Series and np.record rows alike
+    try:
+        return float(example['target_savings'])
+    except KeyError:
+        return 0.0
+    except (TypeError, ValueError):
+        return float("nan")
+
+def _token_count(prediction: dspy.Prediction) -> int:
+    """Estimated output tokens, as attached by PaymentRouter.forward."""
+    token_count = getattr(prediction, 'token_count', None)
+    if token_count is None:
+        # Predictions from other modules: fall back to the same ~4 chars/token estimate
+        token_count = len(str(prediction)) // 4
+    return token_count
+
+# Field layout of one mock payment example (fixed-width, so all examples share one buffer)
+_PAYMENT_DTYPE = [
+    ("amount", "f4"),
+    ("currency", "U3"),
+    ("invoice_details", "U64"),
+    ("query_cost", "f4"),
+    ("user_balance", "i4"),
+    ("urgency", "U8"),
+    ("target_savings", "f4"),
+]
 
-def create_mock_payment_dataset() -> List[Dict]:
+def create_mock_payment_records() -> np.recarray:
     """
-    Create mock dataset for GEPA evolution testing.
-    Simulates real payment scenarios with target savings.
+    Create the mock payment examples as one NumPy record array.
+    Columns are contiguous (records.amount) and rows still read like objects (records[0].amount).
     """
-    dataset = []
+    import numpy as np
     
     # Sample payment scenarios
     scenarios = [
@@ -167,24 +393,39 @@ def create_mock_payment_dataset() -> List[Dict]:
         }
     ]
     
-    # Generate variations
-    for scenario in scenarios:
-        for _ in range(20):  # 20 variations per scenario
-            variation = scenario.copy()
-            # Add some randomness
-            variation["amount"] *= np.random.uniform(0.8, 1.2)
-            variation["query_cost"] *= np.random.uniform(0.9, 1.1)
-            variation["target_savings"] *= np.random.uniform(0.8, 1.2)
-            dataset.append(variation)
-    
-    return dataset
+    # Generate variations: fill each column of a preallocated array, then scale whole columns at once
+    rng = np.random.default_rng()
+    n_variations = 20  # 20 variations per scenario
+    size = len(scenarios) * n_variations
+    
+    records = np.empty(size, dtype=_PAYMENT_DTYPE)
+    for field in records.dtype.names:
+        records[field] = np.repeat([scenario[field] for scenario in scenarios], n_variations)
+    records["amount"] *= rng.uniform(0.8, 1.2, size)
+    records["query_cost"] *= rng.uniform(0.9, 1.1, size)
+    records["target_savings"] *= rng.uniform(0.8, 1.2, size)
+    
+    return records.view(np.recarray)
+
+def create_mock_payment_dataset() -> pd.DataFrame:
+    """
+    Create mock dataset for GEPA evolution testing.
+    Simulates real payment scenarios with target savings, one row per example.
+    """
+    import pandas as pd
+    
+    return pd.DataFrame(create_mock_payment_records())
 
 def evolve_payment_optimizer(budget: int = 150) -> PaymentRouter:
     """
     Evolve the payment optimizer using GEPA.
     Returns an optimized PaymentRouter with evolved prompts and logic.
     """
+    from gepa import GEPA
+    from gepa.adapters.dspy_full_program_adapter import DSPyFullProgramAdapter
+    
     print("🚀 Starting GEPA evolution for payment optimization...")
+    task_lm = _configure_lm()
     
     # Initialize baseline program
     initial_router = PaymentRouter()
@@ -200,7 +441,7 @@ def evolve_payment_optimizer(budget: int = 150) -> PaymentRouter:
     gepa = GEPA(
         adapter=adapter,
         metric=metric,
-        task_lm=lm,  # Perplexity for task execution
+        task_lm=task_lm,  # Perplexity for task execution
         reflection_lm=dspy.OpenAI(model='gpt-4o'),  # Stronger LM for reflection
         budget=budget
     )
@@ -227,8 +468,8 @@ def evolve_payment_optimizer(budget: int = 150) -> PaymentRouter:
         }
     }
     
-    with open("evolved_payment_config.json", "w") as f:
-        json.dump(evolved_config, f, indent=2)
+    with open("evolved_payment_config.json", "wb") as f:
+        f.write(orjson.dumps(evolved_config, option=orjson.OPT_INDENT_2))
     
     print("💾 Saved evolved configuration to evolved_payment_config.json")
     
@@ -239,6 +480,7 @@ def test_evolved_optimizer(evolved_router: PaymentRouter) -> Dict[str, Any]:
     Test the evolved optimizer on sample scenarios.
     Returns performance metrics and sample outputs.
     """
+    _configure_lm()
     print("🧪 Testing evolved payment optimizer...")
     
     test_scenarios = [
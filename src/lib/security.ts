@@ -38,11 +38,12 @@ export function addSecurityHeaders(response: NextResponse): NextResponse {
   return response;
 }
 
-// Rate limiting middleware
+// Rate limiting middleware (cost = how many requests this call counts as)
 export function checkRateLimit(
   identifier: string, 
   limit: number = 100, 
-  windowMs: number = 15 * 60 * 1000 // 15 minutes
+  windowMs: number = 15 * 60 * 1000, // 15 minutes
+  cost: number = 1
 ): { allowed: boolean; remaining: number; resetTime: number } {
   const now = Date.now();
   const key = `rate_limit:${identifier}`;
@@ -50,20 +51,28 @@ export function checkRateLimit(
   const current = rateLimitStore.get(key);
   
   if (!current || now > current.resetTime) {
+    if (cost > limit) {
+      return {
+        allowed: false,
+        remaining: limit,
+        resetTime: now + windowMs
+      };
+    }
+    
     // Reset or initialize
     rateLimitStore.set(key, {
-      count: 1,
+      count: cost,
       resetTime: now + windowMs
     });
     
     return {
       allowed: true,
-      remaining: limit - 1,
+      remaining: limit - cost,
       resetTime: now + windowMs
     };
   }
   
-  if (current.count >= limit) {
+  if (current.count + cost > limit) {
     return {
       allowed: false,
       remaining: 0,
@@ -72,7 +81,7 @@ export function checkRateLimit(
   }
   
   // Increment counter
-  current.count++;
+  current.count += cost;
   rateLimitStore.set(key, current);
   
   return {
@@ -83,9 +92,9 @@ export function checkRateLimit(
 }
 
 // IP-based rate limiting
-export function checkIPRateLimit(request: NextRequest): { allowed: boolean; remaining: number; resetTime: number } {
+export function checkIPRateLimit(request: NextRequest, cost: number = 1): { allowed: boolean; remaining: number; resetTime: number } {
   const ip = getClientIP(request);
-  return checkRateLimit(ip, 1000, 15 * 60 * 1000); // 1000 requests per 15 minutes per IP
+  return checkRateLimit(ip, 1000, 15 * 60 * 1000, cost); // 1000 requests per 15 minutes per IP
 }
 
 // Get client IP address